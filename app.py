@@ -4,20 +4,30 @@
 Recipe Studio – Local AI via Ollama (single file)
 - Robust output: JSON-enforced, multi-stage repair, heuristic fallback (never fails)
 - No JSON-looking UI ever; clean human text only
-- Centered overlay with animated "Generating ..."
+- Centered overlay with a spinner and live "Generating …" token count
 - Unique titles per session; auto-crafted title/description if weak
 - Copy to clipboard (no export button)
 """
 
 import asyncio
+import copy
+import hashlib
 import json
 import re
-import requests
+import sys
+import httpx
 import flet as ft
 
+try:  # optional fast parser; stdlib json otherwise
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 # ---- Ollama config ----
 OLLAMA_URL = "http://127.0.0.1:11434/api/generate"
 OLLAMA_MODEL = "tinyllama"
+OLLAMA_KEEP_ALIVE = "30m"  # how long Ollama keeps the model loaded after a call
 
 SYSTEM_STYLE = (
     "You are a precise culinary assistant. "
@@ -34,67 +44,174 @@ def build_prompt(idea: str) -> str:
         "a short description, a clear ingredient list, and 5–10 concise steps."
     )
 
-# ---------------- Parsing & Repair ----------------
-_JSON_SIGNS = re.compile(r"[{}\[\]`]|\"")
+# ---------------- Response cache ----------------
+# Exact-match cache of parsed model output, keyed on model + system prompt +
+# normalized idea. Only successful parses are stored, never fallbacks. Each
+# entry also keeps the title it was shown under, so both are evicted together.
+_CACHE_MAX = 256
+_SYSTEM_STYLE_HASH = hashlib.sha1(SYSTEM_STYLE.encode("utf-8")).hexdigest()[:12]
+_EXACT_CACHE: dict[tuple, list] = {}  # key -> [data, shown title or None]
+
+def _cache_key(idea: str) -> tuple:
+    return (OLLAMA_MODEL, _SYSTEM_STYLE_HASH, " ".join((idea or "").lower().split()))
+
+def _cache_get(key: tuple):
+    """(data, shown title or None) for a cached idea, else None."""
+    hit = _EXACT_CACHE.pop(key, None)
+    if hit is None:
+        return None
+    _EXACT_CACHE[key] = hit  # re-insert as most recently used
+    return copy.deepcopy(hit[0]), hit[1]
+
+def _cache_put(key: tuple, data: dict):
+    _EXACT_CACHE.pop(key, None)
+    if len(_EXACT_CACHE) >= _CACHE_MAX:
+        _EXACT_CACHE.pop(next(iter(_EXACT_CACHE)))
+    _EXACT_CACHE[key] = [copy.deepcopy(data), None]
 
-def extract_json_block(text: str):
-    """Try clean JSON in a few common shapes."""
+def _cache_set_title(key: tuple, title: str):
+    # No-op for ideas that were never cached (fallback parses)
+    hit = _EXACT_CACHE.get(key)
+    if hit is not None:
+        hit[1] = title
+
+# ---------------- Parsing & Repair ----------------
+_STRIP_TABLE = str.maketrans("", "", '{}[]`"')
+_RE_SINGLE_QUOTE = re.compile(r"(?<!\\)'")
+_QUOTE_TABLE = {ord("'"): ord('"')}
+_RE_BARE_KEY = re.compile(r'(\b[a-zA-Z_][a-zA-Z0-9_]*\b)\s*:')
+_RE_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_SECTIONS = r"(ingredients?|steps?|method|directions?)"
+# "Ingredients", "## Method:", "**Steps**" on a line of their own
+_RE_HEADER_LINE = re.compile(rf"[\s#*]*{_SECTIONS}[\s*]*(?::|$)", re.I)
+# "Sure! Steps: ..." after prose on the same line; needs the colon
+_RE_HEADER_INLINE = re.compile(rf"\b{_SECTIONS}\s*:", re.I)
+_RE_BULLET = re.compile(r"\s*[-*]\s+")
+_RE_STEP_NUM = re.compile(r"^\s*\d+[\).\s-]+\s*")
+_LABELS = r"(?:title|step|steps|ingredient|ingredients|description|servings|time_minutes)\s*:\s*"
+_RE_LABEL_STRIP = re.compile(rf"\b{_LABELS}", re.I)
+_RE_LEADING_NUM = re.compile(r"^\s*([0-9]+[\.)]|[-*•])\s*")
+_RE_WS = re.compile(r"\s+")
+_RE_COMMA_SP = re.compile(r"\s*,\s*")
+_BATCH_SEP = "\x00"  # not matched by \s, so items never bleed into each other
+# Batch-only: every item is preceded by the separator, so no lookbehind is needed
+_RE_LEADING_NUM_BATCH = re.compile(r"\x00\s*(?:[0-9]+[\.)]|[-*•])\s*")
+_DECODER = json.JSONDecoder()
+
+def _iter_fenced_blocks(text: str):
+    """Yield (is_json_tagged, body) for each ``` ... ``` block."""
+    i = text.find("```")
+    while i >= 0:
+        j = text.find("```", i + 3)
+        if j < 0:
+            return
+        body = text[i + 3:j]
+        tagged = body[:4].lower() == "json"
+        yield tagged, (body[4:] if tagged else body).strip()
+        i = text.find("```", j + 3)
+
+def _iter_brace_positions(text: str, start: int = 0):
+    """Yield the index of every "{" using str.find (no regex, no list)."""
+    i = text.find("{", start)
+    while i >= 0:
+        yield i
+        i = text.find("{", i + 1)
+
+def _iter_json_candidates(text: str, start: int = 0):
+    """Yield each top-level balanced { ... } span once (braces in strings ignored)."""
+    depth = 0
+    in_str = esc = False
+    for i, ch in enumerate(text[start:], start):
+        if in_str:
+            if esc:
+                esc = False
+            elif ch == "\\":
+                esc = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            # Quotes only matter inside an object; prose quotes are ignored
+            in_str = depth > 0
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                yield text[start:i + 1]
+
+def extract_json_block(text: str, start_hint: int = 0):
+    """
+    Try clean JSON in a few common shapes.
+    start_hint: index of the first "{" if the caller already knows it.
+    """
     if not text:
         return None
-    # ```json ... ```
-    m = re.search(r"```json\s*(\{.*?\})\s*```", text, flags=re.S | re.I)
-    if m:
-        try:
-            return json.loads(m.group(1))
-        except Exception:
-            pass
-    # ``` ... ```
-    m = re.search(r"```\s*(\{.*?\})\s*```", text, flags=re.S | re.I)
-    if m:
+    # ```json ... ``` first, then ``` ... ```
+    if "```" in text:
+        blocks = sorted(_iter_fenced_blocks(text), key=lambda b: not b[0])
+        for _, body in blocks:
+            if body.startswith("{") and body.endswith("}"):
+                try:
+                    return _loads(body)
+                except Exception:
+                    pass
+    first = text.find("{", start_hint)
+    if first >= 0:
+        # Common case (format=json): a valid object at the first {, one C-level parse
         try:
-            return json.loads(m.group(1))
+            return _DECODER.raw_decode(text, first)[0]
         except Exception:
             pass
-    # First plausible { ... }
-    starts = [m.start() for m in re.finditer(r"\{", text)]
-    for s in starts:
-        for e in range(len(text), s, -1):
-            chunk = text[s:e]
+        # Balanced top-level { ... } spans, one parse each
+        for chunk in _iter_json_candidates(text, first):
             try:
-                return json.loads(chunk)
+                return _loads(chunk)
+            except Exception:
+                continue
+        # First valid object starting at any later { (catches objects nested in junk)
+        for i in _iter_brace_positions(text, first + 1):
+            try:
+                return _DECODER.raw_decode(text, i)[0]
             except Exception:
                 continue
     # Direct
     try:
-        return json.loads(text)
+        return _loads(text)
     except Exception:
         return None
 
-def repair_json_like(text: str):
+def repair_json_like(text: str, start_hint: int | None = None):
     """
     Heuristic repair for almost-JSON:
+    - Keep substring { ... } (from start_hint, the first "{", if given)
     - Strip fences
-    - Keep substring { ... }
     - Quote bare keys
     - Convert single quotes to double (strings/keys)
     - Remove trailing commas
     """
     if not text:
         return None
-    # Remove code fences/backticks
-    t = re.sub(r"```.*?```", lambda m: m.group(0).replace("```", ""), text, flags=re.S)
     # Keep between first { and last }
-    if "{" in t and "}" in t:
-        t = t[t.find("{"): t.rfind("}") + 1]
+    start = text.find("{") if start_hint is None else start_hint
+    end = text.rfind("}")
+    t = text[start:end + 1] if 0 <= start < end else text
+    # Remove code fences/backticks
+    t = t.replace("```", "")
     # Convert single quotes around keys/values to double quotes (safe-ish)
-    t = re.sub(r"(?<!\\)'", '"', t)  # naive but effective for LLM outputs
+    # (naive but effective for LLM outputs; regex only needed for escaped \')
+    if "\\'" in t:
+        t = _RE_SINGLE_QUOTE.sub('"', t)
+    else:
+        t = t.translate(_QUOTE_TABLE)
     # Quote bare keys: key: -> "key":
-    t = re.sub(r'(\b[a-zA-Z_][a-zA-Z0-9_]*\b)\s*:', r'"\1":', t)
+    t = _RE_BARE_KEY.sub(r'"\1":', t)
     # Remove trailing commas before } ]
-    t = re.sub(r",\s*([}\]])", r"\1", t)
+    t = _RE_TRAILING_COMMA.sub(r"\1", t)
     # Ensure lists are arrays even if newline text appears (we'll coerce later)
     try:
-        return json.loads(t)
+        return _loads(t)
     except Exception:
         return None
 
@@ -105,40 +222,50 @@ def heuristic_from_text(text: str, idea: str):
     if not text:
         text = ""
     cleaned = text.replace("•", "-")
-    # Grab ingredients section
-    ing = []
-    steps = []
-
-    # Try to detect labeled sections
-    ing_match = re.search(r"(ingredients?)\s*[:\n]+(.*?)(?:\n\s*(steps?|method|directions?)\s*:|\Z)", cleaned, flags=re.I | re.S)
-    steps_match = re.search(r"(steps?|method|directions?)\s*[:\n]+(.*)", cleaned, flags=re.I | re.S)
-
-    if ing_match:
-        block = ing_match.group(2)
-        for line in block.splitlines():
+    # Labeled sections win; loose bullets/numbers anywhere are the fallback
+    ing, steps = [], []
+    loose_ing, loose_steps = [], []
+    section = None
+    seen_ing = seen_steps = False
+
+    # Single pass: a header ("Ingredients:", "## Method", "Sure! Steps: ...")
+    # switches section; text after it on the same line belongs to that section.
+    # Bulleted/numbered lines are items, never headers.
+    for line in cleaned.splitlines():
+        m = None
+        if _RE_BULLET.match(line):
+            loose_ing.append(line.strip(" -*\t\r\n"))
+        elif _RE_STEP_NUM.match(line):
+            loose_steps.append(_RE_STEP_NUM.sub("", line).strip())
+        else:
+            m = _RE_HEADER_LINE.match(line)
+            if not m:
+                # Mid-line only opens a section not seen yet, so a step like
+                # "Fold in the dry ingredients: flour, cocoa" stays a step
+                m = _RE_HEADER_INLINE.search(line)
+                if m and (seen_ing if m.group(1).lower().startswith("ingredient") else seen_steps):
+                    m = None
+        if m:
+            if m.group(1).lower().startswith("ingredient"):
+                section, seen_ing = "ing", True
+            else:
+                section, seen_steps = "steps", True
+            line = line[m.end():]
+
+        if section == "ing":
             line = line.strip(" -*\t\r\n")
             if line:
                 ing.append(line)
-    else:
-        # Fallback: collect dashed lines anywhere
-        for line in cleaned.splitlines():
-            if re.match(r"\s*[-*]\s+", line):
-                ing.append(line.strip(" -*\t\r\n"))
-
-    if steps_match:
-        block = steps_match.group(2)
-        for line in block.splitlines():
-            line = line.strip()
-            if re.match(r"^\s*\d+[\).\s-]+", line):
-                # strip leading numbering
-                line = re.sub(r"^\s*\d+[\).\s-]+\s*", "", line)
+        elif section == "steps":
+            # strip leading numbering
+            line = _RE_STEP_NUM.sub("", line.strip())
             if line:
                 steps.append(line)
-    else:
-        # Fallback: any numbered lines
-        for line in cleaned.splitlines():
-            if re.match(r"^\s*\d+[\).\s-]+", line):
-                steps.append(re.sub(r"^\s*\d+[\).\s-]+\s*", "", line).strip())
+
+    if not seen_ing:
+        ing = loose_ing
+    if not seen_steps:
+        steps = loose_steps
 
     # Final safety nets
     if not ing:
@@ -167,14 +294,35 @@ def _coerce_list(value):
     return [value]
 
 def _clean_text(s: str) -> str:
-    s = (s or "").strip()
-    s = _JSON_SIGNS.sub("", s)
-    s = re.sub(r"\b(title|step|steps|ingredient|ingredients|description|servings|time_minutes)\s*:\s*", "", s, flags=re.I)
-    s = re.sub(r"^\s*([0-9]+[\.)]|[-*•])\s*", "", s)
-    s = re.sub(r"\s+", " ", s)
-    s = re.sub(r"\s*,\s*", ", ", s)
+    # Plain-string .sub calls stay in C; skip the passes that can't match
+    s = (s or "").strip().translate(_STRIP_TABLE)
+    if ":" in s:
+        s = _RE_LABEL_STRIP.sub("", s)
+    s = _RE_LEADING_NUM.sub("", s, 1)
+    s = _RE_WS.sub(" ", s)
+    if "," in s:
+        s = _RE_COMMA_SP.sub(", ", s)
     return s.strip()
 
+def _sanitize_batch(items: list[str]) -> list[str]:
+    """_clean_text over many strings at once: the same passes, run once over the joined list."""
+    s = _BATCH_SEP + _BATCH_SEP.join(items)
+    # The label pass over a whole list costs more than it saves, and a separator
+    # inside an item would split it; both go one by one
+    if len(items) < 2 or ":" in s or s.count(_BATCH_SEP) != len(items):
+        return [c for c in map(_clean_text, items) if c]
+    s = _RE_LEADING_NUM_BATCH.sub(_BATCH_SEP, s.translate(_STRIP_TABLE))
+    s = _RE_WS.sub(" ", s)
+    if "," in s:
+        s = _RE_COMMA_SP.sub(", ", s)
+    return [p for p in (part.strip() for part in s.split(_BATCH_SEP)[1:]) if p]
+
+def _plainify_all(raw: list, plainify) -> list[str]:
+    items = [x for x in raw if str(x).strip()]
+    if any(isinstance(x, (dict, list, tuple)) for x in items):
+        return [c for c in map(plainify, items) if c]
+    return _sanitize_batch([str(x) for x in items])
+
 def _plainify_ingredient(x) -> str:
     if isinstance(x, dict):
         name = x.get("name") or x.get("ingredient") or x.get("item")
@@ -209,7 +357,46 @@ def _as_int(v, default):
     except Exception:
         return default
 
+_WEAK_TITLES = {"untitled recipe", "recipe"}
+_WEAK_DESCS = {"a delicious dish created by ai.", "a delicious dish created by ai"}
+# Anything _clean_text would rewrite in an already-stripped string
+_RE_NEEDS_CLEAN = re.compile(
+    rf"[{{}}\[\]`\"]|[^\S ]| {{2}}|\s,|,(?! )|^(?:[0-9]+[\.)]|[-*•])|\b{_LABELS}",
+    re.I,
+)
+
+def _is_clean_text(s) -> bool:
+    if not isinstance(s, str):
+        return False
+    s = s.strip()
+    return bool(s) and not _RE_NEEDS_CLEAN.search(s)
+
+def _is_clean(d) -> bool:
+    """True when d already matches the schema and sanitizing would only strip."""
+    return (
+        isinstance(d, dict)
+        and _is_clean_text(d.get("title")) and d["title"].strip().lower() not in _WEAK_TITLES
+        and _is_clean_text(d.get("description")) and d["description"].strip().lower() not in _WEAK_DESCS
+        and type(d.get("servings")) is int  # not bool: _as_int(True) is 1
+        and type(d.get("time_minutes")) is int
+        and isinstance(d.get("ingredients"), list) and bool(d["ingredients"])
+        and all(map(_is_clean_text, d["ingredients"]))
+        and isinstance(d.get("steps"), list) and bool(d["steps"])
+        and all(map(_is_clean_text, d["steps"]))
+    )
+
 def sanitize_recipe_data(data: dict, idea: str):
+    # Fast path: format=json output usually needs nothing but a strip
+    if _is_clean(data):
+        out = dict(data)
+        out.update(
+            title=data["title"].strip(),
+            description=data["description"].strip(),
+            ingredients=[x.strip() for x in data["ingredients"]],
+            steps=[x.strip() for x in data["steps"]],
+        )
+        return out
+
     out = dict(data or {})
     title = _clean_text(out.get("title") or "").strip()
     desc = _clean_text(out.get("description") or "").strip()
@@ -220,13 +407,13 @@ def sanitize_recipe_data(data: dict, idea: str):
     ingredients_raw = _coerce_list(out.get("ingredients"))
     steps_raw = _coerce_list(out.get("steps"))
 
-    ingredients = [_plainify_ingredient(x) for x in ingredients_raw if str(x).strip()]
-    steps = [_plainify_step(x) for x in steps_raw if str(x).strip()]
+    ingredients = _plainify_all(ingredients_raw, _plainify_ingredient)
+    steps = _plainify_all(steps_raw, _plainify_step)
 
     # Strengthen weak fields (no "Untitled" or generic desc)
-    if not title or title.lower() in {"untitled recipe", "recipe"}:
+    if not title or title.lower() in _WEAK_TITLES:
         title = idea.strip().title() if idea.strip() else "Chef's Quick Weeknight Dish"
-    if not desc or desc.lower() in {"a delicious dish created by ai.", "a delicious dish created by ai"}:
+    if not desc or desc.lower() in _WEAK_DESCS:
         base = idea.strip()
         desc = f"{base.capitalize()} turned into a balanced, easy-to-cook recipe." if base else "A tasty, no-fuss recipe."
 
@@ -245,13 +432,59 @@ def sanitize_recipe_data(data: dict, idea: str):
     )
     return out
 
+# Ingredients/steps are rendered as Markdown; keep their text literal
+_MD_ESCAPE = str.maketrans({"\\": "\\\\", "*": r"\*", "_": r"\_"})
+# At the start of an item these open a heading, quote, nested list, table or fence
+_RE_MD_BLOCK_START = re.compile(r"^(?=[#+>=|~-])")
+_RE_MD_ORDERED_START = re.compile(r"^(\d+)([.)])")
+
+def _md_escape(s: str) -> str:
+    s = _RE_MD_BLOCK_START.sub(r"\\", s.translate(_MD_ESCAPE), 1)
+    return _RE_MD_ORDERED_START.sub(r"\1\\\2", s, 1)
+
+def _md_list(items: list[str], numbered: bool = False) -> str:
+    if numbered:
+        return "\n".join(f"{i}. {_md_escape(s)}" for i, s in enumerate(items, 1))
+    return "\n".join(f"- {_md_escape(s)}" for s in items)
+
+def _meta_bits(data: dict) -> list[str]:
+    bits = []
+    if isinstance(data.get("servings"), int):
+        bits.append(f"Servings: {data['servings']}")
+    if isinstance(data.get("time_minutes"), int):
+        bits.append(f"Time: {data['time_minutes']} min")
+    return bits
+
+def recipe_markdown(data: dict) -> str:
+    """Clipboard markdown for a sanitized recipe."""
+    title = data.get("title") or "Chef's Quick Weeknight Dish"
+    parts = [f"# {title}"]
+    meta = " • ".join(_meta_bits(data))
+    if meta:
+        parts.append(f"*{meta}*")
+    if data.get("description"):
+        parts.append(data["description"])
+    parts.append(f"## Ingredients\n{_md_list(data.get('ingredients', []))}")
+    parts.append(f"## Steps\n{_md_list(data.get('steps', []), numbered=True)}")
+    return "\n\n".join(parts)
+
 # ------------- App -------------
 class RecipeStudio:
     def __init__(self):
         self.page: ft.Page | None = None
         self.loading = False
         self._seen_titles = {}
-        self._anim_token = 0
+        self._stop_evt = asyncio.Event()
+        self._tokens_seen = 0
+        self._last_markdown: str | None = None
+        # Pooled keep-alive client for Ollama; runs on Flet's event loop
+        self._http = httpx.AsyncClient(
+            timeout=90,
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+            ),
+        )
 
         self.idea_input: ft.TextField | None = None
         self.generate_btn: ft.ElevatedButton | None = None
@@ -376,7 +609,11 @@ class RecipeStudio:
             padding=20,
             border_radius=16,
             bgcolor=ft.Colors.with_opacity(0.25, ft.Colors.BLACK),
-            content=ft.Row([self.overlay_label], alignment=ft.MainAxisAlignment.CENTER),
+            content=ft.Row(
+                [ft.ProgressRing(width=22, height=22, stroke_width=3, color=ft.Colors.WHITE), self.overlay_label],
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=12,
+            ),
         )
         self.overlay_container = ft.Container(
             visible=False,
@@ -387,72 +624,122 @@ class RecipeStudio:
         return self.overlay_container
 
     # ---------- Async overlay animation ----------
-    async def _animate_generating(self, token: int):
-        dots = ["Generating .", "Generating ..", "Generating ..."]
-        i = 0
-        while self.loading and token == self._anim_token:
-            if self.overlay_label:
-                self.overlay_label.value = dots[i % len(dots)]
+    async def _animate_generating(self, stop_evt: asyncio.Event):
+        # The ProgressRing spins client-side; only push the label when the
+        # streamed token count has moved. Exits as soon as stop_evt is set.
+        shown = 0
+        while not stop_evt.is_set():
+            n = self._tokens_seen
+            if n != shown and self.overlay_label:
+                self.overlay_label.value = f"Generating … {n} tokens"
                 self.overlay_label.update()
-            await asyncio.sleep(0.35)
-            i += 1
+                shown = n
+            try:
+                await asyncio.wait_for(stop_evt.wait(), 0.35)
+            except asyncio.TimeoutError:
+                pass
 
+    # Overlay toggles only mutate state; callers push one page.update()
     def _start_overlay(self):
         self.loading = True
-        self._anim_token += 1
+        # Fresh event per run, so a late wakeup of the previous loop can't
+        # see a cleared flag and keep going
+        self._stop_evt = asyncio.Event()
+        self._tokens_seen = 0
         if self.overlay_container:
+            self.overlay_label.value = "Generating …"
             self.overlay_container.visible = True
-            self.overlay_container.update()
-        self.page.run_task(self._animate_generating, self._anim_token)
+        self.page.run_task(self._animate_generating, self._stop_evt)
 
     def _stop_overlay(self):
         self.loading = False
-        self._anim_token += 1
+        self._stop_evt.set()
         if self.overlay_container:
             self.overlay_container.visible = False
-            self.overlay_container.update()
 
     # ---------- Model call with retries ----------
-    def _call_model_once(self, prompt: str) -> str:
+    async def _warmup(self):
+        """Load the model in the background so the first Generate skips the cold start."""
+        payload = {
+            "model": OLLAMA_MODEL,
+            "prompt": "ok",
+            "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "options": {"num_predict": 1},
+        }
+        try:
+            await self._http.post(OLLAMA_URL, json=payload)
+        except Exception:
+            pass  # Ollama not up yet; the first real call will load it
+
+    async def _call_model_once(self, prompt: str) -> str:
         payload = {
             "model": OLLAMA_MODEL,
             "prompt": prompt,
             "system": SYSTEM_STYLE,
-            "stream": False,
+            "stream": True,
             "options": {"temperature": 0.2},
             # Ask Ollama for strict JSON if supported by the model
             "format": "json",
+            "keep_alive": OLLAMA_KEEP_ALIVE,
         }
-        resp = requests.post(OLLAMA_URL, json=payload, timeout=90)
-        resp.raise_for_status()
-        return resp.json().get("response", "")
-
-    def _call_model(self, idea: str) -> dict:
+        # Stream tokens so the overlay can show progress; the animation loop
+        # picks up _tokens_seen on its next tick.
+        buf = []
+        self._tokens_seen = 0
+        async with self._http.stream("POST", OLLAMA_URL, json=payload) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line:
+                    continue
+                chunk = _loads(line)
+                piece = chunk.get("response")
+                if piece:
+                    buf.append(piece)
+                    self._tokens_seen = len(buf)
+                if chunk.get("done"):
+                    break
+        return "".join(buf)
+
+    async def _call_model(self, idea: str) -> tuple[dict, tuple, str | None]:
         """
         Attempts:
           1) Strict JSON (format=json) with full prompt
           2) Strict JSON fallback with generic idea
           3) Parse/repair/heuristic from whatever text we got
+        Repeat ideas are served from the exact-match cache without calling Ollama.
+        Returns (data, cache key, title shown on a cache hit or None).
         """
-        prompts = [build_prompt(idea), build_prompt("Create a great new dish.")]
+        key = _cache_key(idea)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached[0], key, cached[1]
+
+        def prompts():
+            # Built lazily: the fallback prompt is rarely needed
+            yield build_prompt(idea)
+            yield build_prompt("Create a great new dish.")
+
         last_text = ""
-        for p in prompts:
+        for attempt, p in enumerate(prompts()):
             try:
-                text = self._call_model_once(p)
+                text = await self._call_model_once(p)
                 last_text = text or last_text
-                # Stage A: direct JSON
-                d = extract_json_block(text)
+                brace = text.find("{")
+                if brace < 0:
+                    continue  # no JSON possible; retry, then heuristic
+                # Stage A: direct JSON, Stage B: repair
+                d = extract_json_block(text, brace) or repair_json_like(text, brace)
                 if d:
-                    return d
-                # Stage B: repair
-                d = repair_json_like(text)
-                if d:
-                    return d
+                    # Only the idea's own prompt is worth remembering for it
+                    if attempt == 0 and isinstance(d, dict):
+                        _cache_put(key, d)
+                    return d, key, None
             except Exception:
                 continue
 
         # Stage C: heuristic from last text or from idea
-        return heuristic_from_text(last_text or "", idea)
+        return heuristic_from_text(last_text or "", idea), key, None
 
     # ---------- Generate flow ----------
     def on_generate(self, e):
@@ -464,32 +751,34 @@ class RecipeStudio:
             return
 
         self.generate_btn.disabled = True
-        self.generate_btn.update()
         self._start_overlay()
+        self.page.update()
         self.page.run_task(self._generate_and_render, idea)
 
     async def _generate_and_render(self, idea: str):
         try:
-            raw = await asyncio.to_thread(self._call_model, idea)
+            raw, key, shown_title = await self._call_model(idea)
             data = sanitize_recipe_data(raw, idea)
-            data["title"] = self._unique_title(data.get("title") or "Chef's Quick Weeknight Dish")
-            self._render_recipe(data)
-
+            if shown_title:
+                # Same recipe as before, so same title; no "(vN)" bump
+                data["title"] = shown_title
+            else:
+                data["title"] = self._unique_title(data.get("title") or "Chef's Quick Weeknight Dish")
+                _cache_set_title(key, data["title"])
+            self._render_recipe(data, update=False)
             self.copy_btn.visible = True
-            self.copy_btn.update()
             self.reset_btn.visible = True
-            self.reset_btn.update()
         except Exception as ex2:
             # As a last resort, show a graceful recipe built from idea
             data = heuristic_from_text("", idea)
             data = sanitize_recipe_data(data, idea)
             data["title"] = self._unique_title(data["title"])
-            self._render_recipe(data)
-            self._snack(f"Recovered from an error; showing a stable recipe.")
+            self._render_recipe(data, update=False)
+            self._snack(f"Recovered from an error; showing a stable recipe.", update=False)
         finally:
+            # Single round-trip for recipe, buttons and overlay
             self._stop_overlay()
             self.generate_btn.disabled = False
-            self.generate_btn.update()
             self.page.update()
 
     # ---------- Reset / Copy ----------
@@ -499,10 +788,11 @@ class RecipeStudio:
         self.reset_btn.visible = False
         self.copy_btn.visible = False
         self.recipe_card.content.controls[-1] = self.empty_state()
+        self._last_markdown = None
         self.page.update()
 
     def on_copy(self, e):
-        md = self._current_recipe_markdown()
+        md = self._last_markdown
         if not md:
             self._snack("No recipe to copy.")
             return
@@ -527,30 +817,24 @@ class RecipeStudio:
             ),
         )
 
+    # One Markdown control per list instead of one Text per item
     def _ingredients_view(self, ingredients: list[str]) -> ft.Control:
         if len(ingredients) <= 8:
-            return ft.Column([ft.Text(f"• {ing}") for ing in ingredients], spacing=5)
+            return ft.Markdown(_md_list(ingredients), selectable=True)
         half = (len(ingredients) + 1) // 2
-        col1 = ft.Column([ft.Text(f"• {ing}") for ing in ingredients[:half]], spacing=5, expand=True)
-        col2 = ft.Column([ft.Text(f"• {ing}") for ing in ingredients[half:]], spacing=5, expand=True)
-        return ft.Row([col1, col2], spacing=20)
+        col1 = ft.Markdown(_md_list(ingredients[:half]), selectable=True, expand=True)
+        col2 = ft.Markdown(_md_list(ingredients[half:]), selectable=True, expand=True)
+        return ft.Row([col1, col2], spacing=20, vertical_alignment=ft.CrossAxisAlignment.START)
 
     def _steps_view(self, steps: list[str]) -> ft.Control:
-        return ft.Column([ft.Text(f"{i+1}. {s}") for i, s in enumerate(steps)], spacing=8)
+        return ft.Markdown(_md_list(steps, numbered=True), selectable=True)
 
     def _recipe_view(self, data: dict) -> ft.Column:
         title = data.get("title", "Chef's Quick Weeknight Dish")
         desc = data.get("description", "")
-        servings = data.get("servings")
-        time_minutes = data.get("time_minutes")
         ingredients = data.get("ingredients", [])
         steps = data.get("steps", [])
-
-        meta_bits = []
-        if isinstance(servings, int):
-            meta_bits.append(f"Servings: {servings}")
-        if isinstance(time_minutes, int):
-            meta_bits.append(f"Time: {time_minutes} min")
+        meta_bits = _meta_bits(data)
 
         # --- Header (always centered) ---
         header_block = ft.Column(
@@ -587,9 +871,11 @@ class RecipeStudio:
         )
 
 
-    def _render_recipe(self, data: dict):
+    def _render_recipe(self, data: dict, update: bool = True):
         self.recipe_card.content.controls[-1] = self._recipe_view(data)
-        self.recipe_card.update()
+        self._last_markdown = recipe_markdown(data)
+        if update:
+            self.recipe_card.update()
 
     def _render_error(self, message: str):
         self.recipe_card.content.controls[-1] = ft.Container(
@@ -603,59 +889,19 @@ class RecipeStudio:
         )
         self.recipe_card.update()
 
-    def _current_recipe_markdown(self) -> str | None:
-        try:
-            content = self.recipe_card.content.controls[-1]
-            if isinstance(content, ft.Column) and content.controls:
-                parts = []
-                header_block = content.controls[0]
-                if isinstance(header_block, ft.Column) and header_block.controls:
-                    t = header_block.controls[0]
-                    if isinstance(t, ft.Text): parts.append(f"# {t.value}")
-                    meta = header_block.controls[1] if len(header_block.controls) > 1 else None
-                    if isinstance(meta, ft.Text) and meta.value: parts.append(f"*{meta.value}*")
-                    d = header_block.controls[2] if len(header_block.controls) > 2 else None
-                    if isinstance(d, ft.Text) and d.value: parts.append(d.value)
-                ing_card = content.controls[2] if len(content.controls) > 2 else None
-                if isinstance(ing_card, ft.Container):
-                    body = ing_card.content.controls[1] if isinstance(ing_card.content, ft.Column) else None
-                    parts.append("\n## Ingredients")
-                    if isinstance(body, ft.Column):
-                        for item in body.controls:
-                            if isinstance(item, ft.Text): parts.append(f"- {item.value.replace('• ', '')}")
-                    elif isinstance(body, ft.Row):
-                        for col in body.controls:
-                            if isinstance(col, ft.Column):
-                                for item in col.controls:
-                                    if isinstance(item, ft.Text): parts.append(f"- {item.value.replace('• ', '')}")
-                steps_card = content.controls[3] if len(content.controls) > 3 else None
-                if isinstance(steps_card, ft.Container):
-                    body = steps_card.content.controls[1] if isinstance(steps_card.content, ft.Column) else None
-                    parts.append("\n## Steps")
-                    if isinstance(body, ft.Column):
-                        for item in body.controls:
-                            if isinstance(item, ft.Text): parts.append(item.value)
-                return "\n\n".join(parts).strip() or None
-        except Exception:
-            return None
-        return None
-
     # ---------- Helpers ----------
-    def _snack(self, msg: str):
+    def _snack(self, msg: str, update: bool = True):
         self.page.snack_bar = ft.SnackBar(content=ft.Text(msg))
         self.page.snack_bar.open = True
-        self.page.update()
+        if update:
+            self.page.update()
 
     def _unique_title(self, title: str) -> str:
         base = (title or "Chef's Quick Weeknight Dish").strip()
-        key = base.lower()
-        n = self._seen_titles.get(key, 0)
-        if n == 0:
-            self._seen_titles[key] = 1
-            return base
-        n += 1
+        key = sys.intern(base.lower())
+        n = self._seen_titles.get(key, 0) + 1
         self._seen_titles[key] = n
-        return f"{base} (v{n})"
+        return base if n == 1 else f"{base} (v{n})"
 
     def main(self, page: ft.Page):
         self.page = page
@@ -671,6 +917,7 @@ class RecipeStudio:
 
         page.add(ft.Stack(controls=[ft.Column([header, form, result], spacing=0), overlay], expand=True))
         page.update()
+        page.run_task(self._warmup)
 
 if __name__ == "__main__":
     app = RecipeStudio()